@@ -1,19 +1,27 @@
 
 import os
 import re
+import codecs
 import json
 import time
+import queue
 import random
 import logging
 import hashlib
+import threading
+import orjson
 import requests
-import pandas as pd
+import pyarrow as pa
+import pyarrow.json as pj
+import pyarrow.parquet as pq
 from io import BytesIO
 from datetime import datetime
+from urllib.parse import urlsplit
 from urllib.robotparser import RobotFileParser
-from concurrent.futures import ThreadPoolExecutor
-from bs4 import BeautifulSoup
-from langdetect import detect
+from concurrent.futures import Future, ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser
+import cld3
+import ahocorasick
 from PIL import Image
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -24,7 +32,7 @@ from textacy import preprocessing
 # --------------------------
 CONFIG = {
     "output_dir": "ai_training_data",
-    "max_workers": 5,
+    "max_workers": 32,  # fetches are I/O-bound; threads mostly wait on the network
     "request_timeout": 15,
     "rate_limit_delay": 1,
     "user_agents": [
@@ -37,11 +45,45 @@ CONFIG = {
         "blocklist_phrases": ["lorem ipsum", "test content"]
     },
     "storage_formats": ["jsonl", "parquet"],
-    "max_text_storage": 1000,   # flush after 1000 records
+    "max_text_storage": 1000,   # start a new text file every 1000 records
     "retry_attempts": 3,
-    "retry_backoff": 2  # seconds
+    "retry_backoff": 2,  # seconds
+    "download_images": True,
+    "max_image_bytes": 10 * 1024 * 1024,  # skip larger images
+    "max_page_bytes": 5 * 1024 * 1024  # skip larger pages without parsing them
 }
 
+# Statuses retried by the session's Retry adapter
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+# Content types that Pillow cannot decode as images
+UNDECODABLE_IMAGE_TYPES = ("image/svg+xml", "text/")
+
+# Tags checked, in order, for the main content of a page
+MAIN_CONTENT_TAGS = ('article', 'main')
+
+# Characters of cleaned text passed to the language detector
+LANG_DETECT_SAMPLE_CHARS = 2048
+
+# --------------------------
+# Blocklist Matcher
+# --------------------------
+def build_blocklist_automaton(phrases):
+    """
+    Builds an Aho-Corasick automaton over the lowercased phrases so a text
+    can be checked against all of them in a single pass.
+    Returns None when there are no phrases to match.
+    """
+    if not phrases:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase.lower(), phrase)
+    automaton.make_automaton()
+    return automaton
+
+_BLOCKLIST = build_blocklist_automaton(CONFIG["content_filters"]["blocklist_phrases"])
+
 # --------------------------
 # Logging Setup
 # --------------------------
@@ -51,47 +93,204 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# --------------------------
+# Helper Functions
+# --------------------------
+def read_limited(response, max_bytes, chunk_size=64 * 1024):
+    """
+    Reads a streamed response body, giving up once it exceeds max_bytes.
+    Returns the body as bytes, or None if it was too large.
+    """
+    buf = BytesIO()
+    for chunk in response.iter_content(chunk_size):
+        if buf.tell() + len(chunk) > max_bytes:
+            response.close()
+            return None
+        buf.write(chunk)
+    return buf.getvalue()
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be")
+)
+# Matches both <meta charset="..."> and the http-equiv content="...; charset=..." form
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+
+def decode_html(body, response):
+    """
+    Decodes an HTML body to text. A byte-order mark wins, then a charset
+    declared in the Content-Type header, then a <meta charset> in the first
+    1024 bytes; otherwise UTF-8. Undecodable bytes become U+FFFD.
+    """
+    for bom, bom_encoding in _BOMS:
+        if body.startswith(bom):
+            return body[len(bom):].decode(bom_encoding, errors='replace')
+
+    encoding = None
+    # requests falls back to ISO-8859-1 for text/* without a charset, so
+    # only trust response.encoding when the header actually names one
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        encoding = response.encoding
+    if not encoding:
+        match = _META_CHARSET_RE.search(body[:1024])
+        if match:
+            encoding = match.group(1).decode("ascii")
+    try:
+        return body.decode(encoding or "utf-8", errors='replace')
+    except LookupError:
+        # Unknown charset label
+        return body.decode("utf-8", errors='replace')
+
 # --------------------------
 # Helper Classes
 # --------------------------
+# Sentinel telling the storage writer thread to flush and exit
+_STOP_WRITER = object()
+
+# Fixed Parquet schema, so every file gets the same column types
+_TEXT_SCHEMA = pa.schema([
+    ("url", pa.string()),
+    ("content", pa.string()),
+    ("timestamp", pa.string()),
+    ("source_domain", pa.string())
+])
+
+# pyarrow's JSON reader fails on lines longer than its block size. A record
+# is bounded by the page size cap; JSON escaping can grow a character up to
+# 6 bytes (\uXXXX), plus headroom for the other fields.
+_JSONL_READ_OPTIONS = pj.ReadOptions(block_size=6 * CONFIG["max_page_bytes"] + (1 << 20))
+_JSONL_PARSE_OPTIONS = pj.ParseOptions(explicit_schema=_TEXT_SCHEMA)
+
 class StorageManager:
     """
     Manages storage for scraped text and image metadata.
-    Flushes text data to disk in multiple formats.
+    Text records are appended to a JSONL file by a background writer thread;
+    each file is rotated after max_storage records and transcoded to Parquet.
     """
     def __init__(self, output_dir, storage_formats, max_storage):
         self.output_dir = output_dir
         self.storage_formats = storage_formats
         self.max_storage = max_storage
-        self.text_storage = []
         self.image_storage = []
+        self._seen_urls = set()
+        self._seen_hashes = set()
+        self._img_lock = threading.Lock()
 
         os.makedirs(self.output_dir, exist_ok=True)
         # Create an images subfolder
         os.makedirs(os.path.join(self.output_dir, "images"), exist_ok=True)
 
+        # Current JSONL segment; only the writer thread touches these
+        self._jsonl_fh = None
+        self._jsonl_path = None
+        self._jsonl_count = 0
+
+        # Text records are handed to a single writer thread so scrape
+        # workers never block on disk I/O. It starts on the first record,
+        # so the manager can be reused after close().
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
     def store_text(self, data):
-        self.text_storage.append(data)
-        if len(self.text_storage) >= self.max_storage:
-            self.flush_text_storage()
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+                self._writer.start()
+            self._queue.put(data)
+
+    def close(self):
+        """
+        Writes any queued text records, finalizes the current file and stops
+        the writer thread. Safe to call more than once.
+        """
+        # Hold the lock until the writer exits so a new writer can't start
+        # while this one is still rotating the last file
+        with self._writer_lock:
+            if self._writer is None:
+                return
+            self._queue.put(_STOP_WRITER)
+            self._writer.join()
+            self._writer = None
+
+    def _writer_loop(self):
+        while True:
+            data = self._queue.get()
+            if data is _STOP_WRITER:
+                self._safe_rotate()
+                return
+            try:
+                self._append_text(data)
+            except Exception as e:
+                logging.error(f"Error writing text record {data.get('url')}: {e}")
+            if self._jsonl_count >= self.max_storage:
+                self._safe_rotate()
+
+    def _safe_rotate(self):
+        # An exception here would silently kill the writer thread
+        try:
+            self._rotate_segment()
+        except Exception as e:
+            logging.error(f"Error flushing text data: {e}")
+
+    def _append_text(self, data):
+        if self._jsonl_fh is None:
+            timestamp = datetime.now().timestamp()
+            self._jsonl_path = os.path.join(self.output_dir, f"text_{timestamp}.jsonl")
+            # Large buffer coalesces the small per-record writes
+            self._jsonl_fh = open(self._jsonl_path, 'ab', buffering=1 << 20)
+        self._jsonl_fh.write(orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE))
+        self._jsonl_count += 1
 
-    def flush_text_storage(self):
-        if not self.text_storage:
+    def _rotate_segment(self):
+        """
+        Closes the current JSONL file and, if requested, transcodes it to Parquet.
+        The JSONL file is removed afterwards when it isn't a requested format.
+        Must only run on the writer thread.
+        """
+        if self._jsonl_fh is None:
             return
 
-        df = pd.DataFrame(self.text_storage)
-        timestamp = datetime.now().timestamp()
-        if "jsonl" in self.storage_formats:
-            jsonl_path = os.path.join(self.output_dir, f"text_{timestamp}.jsonl")
-            df.to_json(jsonl_path, orient="records", lines=True)
-            logging.info(f"Flushed text data to {jsonl_path}")
+        jsonl_path = self._jsonl_path
+        self._jsonl_fh.close()
+        self._jsonl_fh = None
+        self._jsonl_path = None
+        self._jsonl_count = 0
+        logging.info(f"Flushed text data to {jsonl_path}")
 
         if "parquet" in self.storage_formats:
-            parquet_path = os.path.join(self.output_dir, f"text_{timestamp}.parquet")
-            df.to_parquet(parquet_path)
+            parquet_path = os.path.splitext(jsonl_path)[0] + ".parquet"
+            table = pj.read_json(
+                jsonl_path,
+                read_options=_JSONL_READ_OPTIONS,
+                parse_options=_JSONL_PARSE_OPTIONS
+            )
+            pq.write_table(table, parquet_path, compression='zstd')
             logging.info(f"Flushed text data to {parquet_path}")
 
-        self.text_storage = []
+        if "jsonl" not in self.storage_formats:
+            os.remove(jsonl_path)
+
+    def claim_image_url(self, url):
+        """
+        Records an image URL as seen. Returns False if it was already claimed.
+        """
+        with self._img_lock:
+            if url in self._seen_urls:
+                return False
+            self._seen_urls.add(url)
+            return True
+
+    def claim_image_hash(self, content_hash):
+        """
+        Records an image content hash as seen. Returns False if it was already claimed.
+        """
+        with self._img_lock:
+            if content_hash in self._seen_hashes:
+                return False
+            self._seen_hashes.add(content_hash)
+            return True
 
     def store_image(self, data, image_content):
         """
@@ -108,32 +307,45 @@ class StorageManager:
         except Exception as e:
             logging.error(f"Error saving image {data['filename']}: {e}")
 
+# Built once at import; the pipeline is constant across pages. Tags are
+# already stripped by the HTML parser, so no remove.html_tags stage.
+# textacy's normalize.whitespace is replaced by _ZERO_WIDTH_RE and _WS_RE,
+# run before the pipeline so the replace stages (notably phone numbers,
+# which allow only single spaces between groups) see normalized text.
+# \s does not match zero-width characters, hence the separate pattern.
+_CLEANER = preprocessing.make_pipeline(
+    preprocessing.replace.urls,
+    preprocessing.replace.emails,
+    preprocessing.replace.phone_numbers,
+    preprocessing.normalize.unicode
+)
+_ZERO_WIDTH_RE = re.compile('[\u200B\u2060\uFEFF]+')
+_WS_RE = re.compile(r'\s+')
+
 class ContentExtractor:
     """
-    Extracts and cleans text from a BeautifulSoup-parsed page.
+    Extracts and cleans text from a Lexbor-parsed page.
     """
     @staticmethod
-    def extract(soup):
-        # Try common selectors for main content
-        for selector in ['article', 'main', '[role="main"]']:
-            element = soup.select_one(selector)
-            if element:
-                return element.get_text()
-        # Fallback: extract all text
-        return soup.get_text()
+    def extract(tree):
+        # Try common containers for main content. Plain tag lookups skip
+        # CSS selector compilation; only the attribute match needs css_first.
+        element = None
+        for tag in MAIN_CONTENT_TAGS:
+            nodes = tree.tags(tag)
+            if nodes:
+                element = nodes[0]
+                break
+        else:
+            element = tree.css_first('[role="main"]') or tree.body
+        if element is None:
+            return ""
+        return element.text(separator=' ')
 
     @staticmethod
     def clean(text):
-        cleaner = preprocessing.make_pipeline(
-            preprocessing.normalize.whitespace,
-            preprocessing.remove.html_tags,
-            preprocessing.replace.urls,
-            preprocessing.replace.emails,
-            preprocessing.replace.phone_numbers,
-            preprocessing.normalize.unicode
-        )
-        cleaned = cleaner(text)
-        return re.sub(r'\s+', ' ', cleaned).strip()
+        text = _WS_RE.sub(' ', _ZERO_WIDTH_RE.sub('', text))
+        return _CLEANER(text).strip()
 
 class ImageDownloader:
     """
@@ -144,16 +356,34 @@ class ImageDownloader:
         self.storage_manager = storage_manager
 
     def download(self, url, domain):
+        # Skip images already fetched earlier in the crawl (logos, icons, ...)
+        if not self.storage_manager.claim_image_url(url):
+            return
         try:
-            response = self.session.get(url, stream=True, timeout=CONFIG["request_timeout"])
-            response.raise_for_status()
-            # Validate image content by attempting to open it
-            img = Image.open(BytesIO(response.content))
-            img.verify()  # Verify that it is, indeed, an image
-
-            # Re-open image (verify() leaves the image in an unusable state)
-            img = Image.open(BytesIO(response.content))
-            content_hash = hashlib.sha256(response.content).hexdigest()
+            with self.session.get(
+                url,
+                stream=True,
+                timeout=CONFIG["request_timeout"],
+                headers={"Accept": "image/*"}
+            ) as response:
+                response.raise_for_status()
+                # Pillow cannot decode these, so don't download them at all
+                content_type = response.headers.get("Content-Type", "")
+                if content_type.startswith(UNDECODABLE_IMAGE_TYPES):
+                    logging.info(f"Skipping image {url}: unsupported content type {content_type}")
+                    return
+                content = read_limited(response, CONFIG["max_image_bytes"])
+            if content is None:
+                logging.info(f"Skipping image {url}: larger than {CONFIG['max_image_bytes']} bytes")
+                return
+            content_hash = hashlib.sha256(content).hexdigest()
+            if not self.storage_manager.claim_image_hash(content_hash):
+                logging.info(f"Skipping duplicate image {url}")
+                return
+
+            # Validate image content by fully decoding it once
+            img = Image.open(BytesIO(content))
+            img.load()
             filename = f"{domain}_{content_hash}.{img.format.lower()}"
 
             image_data = {
@@ -164,7 +394,7 @@ class ImageDownloader:
                 "source_domain": domain,
                 "timestamp": datetime.now().isoformat()
             }
-            self.storage_manager.store_image(image_data, response.content)
+            self.storage_manager.store_image(image_data, content)
         except Exception as e:
             logging.error(f"Error downloading image {url}: {e}")
 
@@ -180,6 +410,10 @@ class AIDataScraper:
             max_storage=CONFIG["max_text_storage"]
         )
         self.session = self._init_session()
+        self._robots_cache = {}
+        self._robots_lock = threading.Lock()
+        self._domain_next_ok = {}
+        self._domain_lock = threading.Lock()
         self.image_downloader = ImageDownloader(self.session, self.storage_manager)
 
     def _init_session(self):
@@ -187,107 +421,186 @@ class AIDataScraper:
         retries = Retry(
             total=CONFIG["retry_attempts"],
             backoff_factor=CONFIG["retry_backoff"],
-            status_forcelist=[429, 500, 502, 503, 504]
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            # Hand back the last response so the hook can log it
+            raise_on_status=False
+        )
+        # Size the pool to the worker count so concurrent requests reuse
+        # keep-alive connections instead of reopening TCP/TLS each time.
+        adapter = HTTPAdapter(
+            pool_connections=CONFIG["max_workers"] * 2,
+            pool_maxsize=CONFIG["max_workers"] * 4,
+            max_retries=retries,
+            pool_block=False
         )
-        adapter = HTTPAdapter(max_retries=retries)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
+        # One user agent per session; per-request headers inherit these
+        session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": random.choice(CONFIG["user_agents"]),
+            "Accept-Language": "en-US,en;q=0.9"
+        })
+        session.hooks["response"].append(self._log_failed_response)
         return session
 
+    @staticmethod
+    def _log_failed_response(response, *args, **kwargs):
+        if response.status_code in RETRY_STATUS_CODES:
+            logging.warning(
+                f"Request to {response.url} still failing with status "
+                f"{response.status_code} after retries"
+            )
+
     def get_robots_parser(self, domain):
+        """
+        Returns the robots.txt parser for a domain, fetching it through the
+        shared session only the first time the domain is seen. Concurrent
+        callers for the same domain wait for that single fetch.
+        """
+        with self._robots_lock:
+            future = self._robots_cache.get(domain)
+            is_fetcher = future is None
+            if is_fetcher:
+                future = Future()
+                self._robots_cache[domain] = future
+        if not is_fetcher:
+            return future.result()
+
+        rp, ok = None, False
+        try:
+            rp, ok = self._fetch_robots(domain)
+        finally:
+            if not ok:
+                # Don't cache failures; the next URL for this domain retries
+                with self._robots_lock:
+                    del self._robots_cache[domain]
+            if rp is None:
+                rp = RobotFileParser()
+            future.set_result(rp)
+        return rp
+
+    def _fetch_robots(self, domain):
+        """
+        Fetches and parses robots.txt. Returns (parser, ok), where ok is False
+        if the fetch failed and the result should not be cached.
+        """
+        robots_url = f"{domain}/robots.txt"
         rp = RobotFileParser()
-        rp.set_url(f"{domain}/robots.txt")
+        rp.set_url(robots_url)
         try:
-            rp.read()
+            response = self.session.get(robots_url, timeout=CONFIG["request_timeout"])
+            # Mirror RobotFileParser.read(): auth errors deny everything,
+            # other client errors (e.g. 404) allow everything.
+            if response.status_code in (401, 403):
+                rp.disallow_all = True
+            elif 400 <= response.status_code < 500:
+                rp.allow_all = True
+            else:
+                response.raise_for_status()
+                rp.parse(response.text.splitlines())
         except Exception as e:
             logging.warning(f"Could not read robots.txt from {domain}: {e}")
-        return rp
+            return rp, False
+        return rp, True
+
+    def wait_for_domain(self, domain):
+        """
+        Per-domain rate limiting: reserves the next request slot for the domain
+        and sleeps until it opens. Requests to different domains never wait
+        on each other, and the first request to a domain goes out immediately.
+        """
+        with self._domain_lock:
+            now = time.monotonic()
+            next_ok = self._domain_next_ok.get(domain, now)
+            wait = max(0, next_ok - now)
+            self._domain_next_ok[domain] = max(next_ok, now) + CONFIG["rate_limit_delay"]
+        if wait:
+            time.sleep(wait)
 
     def validate_content(self, text):
         if len(text) < CONFIG["content_filters"]["min_text_length"]:
             return False
         # Check if any blocklist phrases appear
-        for phrase in CONFIG["content_filters"]["blocklist_phrases"]:
-            if phrase.lower() in text.lower():
+        if _BLOCKLIST is not None:
+            text_lower = text.lower()
+            if any(True for _ in _BLOCKLIST.iter(text_lower)):
                 return False
         try:
-            lang = detect(text)
-            if lang not in CONFIG["content_filters"]["allowed_languages"]:
+            # A short prefix is enough for a reliable language guess
+            prediction = cld3.get_language(text[:LANG_DETECT_SAMPLE_CHARS])
+            if prediction is None or not prediction.is_reliable:
+                return False
+            if prediction.language not in CONFIG["content_filters"]["allowed_languages"]:
                 return False
         except Exception as e:
             logging.warning(f"Language detection failed: {e}")
             return False
         return True
 
-    def retry_request(self, func, *args, **kwargs):
-        """
-        Basic retry wrapper with exponential backoff.
-        """
-        attempts = CONFIG["retry_attempts"]
-        backoff = CONFIG["retry_backoff"]
-        for attempt in range(1, attempts + 1):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                logging.error(f"Attempt {attempt} failed with error: {e}")
-                if attempt < attempts:
-                    time.sleep(backoff ** attempt)
-        raise Exception("Maximum retry attempts reached.")
-
     def scrape_page(self, url):
         try:
             # Respect robots.txt
-            domain = url.split('/')[2]
-            rp = self.get_robots_parser(f"https://{domain}")
+            parts = urlsplit(url)
+            domain = parts.netloc
+            rp = self.get_robots_parser(f"{parts.scheme}://{domain}")
             if not rp.can_fetch("*", url):
                 logging.warning(f"Skipping {url} due to robots.txt restrictions")
                 return
 
-            headers = {
-                "User-Agent": random.choice(CONFIG["user_agents"]),
-                "Accept-Language": "en-US,en;q=0.9"
-            }
-
             # Rate limiting
-            time.sleep(CONFIG["rate_limit_delay"])
-            response = self.retry_request(
-                self.session.get, url, headers=headers, timeout=CONFIG["request_timeout"]
-            )
-            response.raise_for_status()
+            self.wait_for_domain(domain)
+            # Closing the streamed response releases its pooled connection
+            with self.session.get(url, stream=True, timeout=CONFIG["request_timeout"]) as response:
+                response.raise_for_status()
+                body = read_limited(response, CONFIG["max_page_bytes"])
+                if body is None:
+                    logging.warning(f"Skipping {url}: larger than {CONFIG['max_page_bytes']} bytes")
+                    return
+                html = decode_html(body, response)
 
-            soup = BeautifulSoup(response.content, 'lxml')
-            raw_text = ContentExtractor.extract(soup)
+            tree = LexborHTMLParser(html)
+            raw_text = ContentExtractor.extract(tree)
             cleaned_text = ContentExtractor.clean(raw_text)
 
-            if self.validate_content(cleaned_text):
-                record = {
-                    "url": url,
-                    "content": cleaned_text,
-                    "timestamp": datetime.now().isoformat(),
-                    "source_domain": domain
-                }
-                self.storage_manager.store_text(record)
-                logging.info(f"Scraped and stored text from {url}")
-            else:
+            if not self.validate_content(cleaned_text):
                 logging.info(f"Content at {url} did not pass validation.")
+                return
 
-            # Process images on the page
-            for img in soup.find_all('img'):
-                img_url = img.get('src')
-                if img_url and img_url.startswith('http'):
-                    self.image_downloader.download(img_url, domain)
+            record = {
+                "url": url,
+                "content": cleaned_text,
+                "timestamp": datetime.now().isoformat(),
+                "source_domain": domain
+            }
+            self.storage_manager.store_text(record)
+            logging.info(f"Scraped and stored text from {url}")
+
+            # Process images only on pages whose text was kept
+            if CONFIG["download_images"]:
+                for img in tree.css('img[src^="http"]'):
+                    img_url = img.attributes.get('src')
+                    if img_url:
+                        self.image_downloader.download(img_url, domain)
 
         except Exception as e:
             logging.error(f"Error scraping {url}: {e}")
 
     def run(self, seed_urls):
-        with ThreadPoolExecutor(max_workers=CONFIG["max_workers"]) as executor:
-            futures = [executor.submit(self.scrape_page, url) for url in seed_urls]
-            for future in futures:
-                try:
-                    future.result()
-                except Exception as e:
-                    logging.error(f"Error in thread: {e}")
+        try:
+            with ThreadPoolExecutor(max_workers=CONFIG["max_workers"]) as executor:
+                futures = [executor.submit(self.scrape_page, url) for url in seed_urls]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logging.error(f"Error in thread: {e}")
+        finally:
+            # Write out everything stored so far, even if the run was interrupted
+            self.storage_manager.close()
 
 # --------------------------
 # Main Execution
@@ -299,6 +612,5 @@ if __name__ == "__main__":
         "https://example.com/article1",
         "https://example.com/article2"
     ]
+    # run() flushes any remaining text data to storage before returning
     scraper.run(seed_urls)
-    # Ensure that any remaining text data is flushed to storage
-    scraper.storage_manager.flush_text_storage()